@@ -1,8 +1,113 @@
-from test_fireworks import FireworksAPI
-from typing import List, Dict, Optional
+from test_fireworks import FireworksAPI, FireworksModel
+import requests
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Union
+import asyncio
+import atexit
+import hashlib
 import json
-import re
-from datetime import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Tags the brain uses to structure its response, mapped to decision keys
+EDGE_TAGS = (
+    ("edge1", "edge1_command"),
+    ("edge2", "edge2_command"),
+)
+BRAIN_TAGS = (
+    ("thinking", "thinking"),
+    ("reasoning", "reasoning"),
+) + EDGE_TAGS
+
+# Agent labels used in the thought log for each edge instance
+EDGE_AGENTS = ("Edge1 (V3)", "Edge2 (V3)")
+
+# Buffered log lines are written out once this many are pending
+LOG_FLUSH_THRESHOLD = 64
+
+# Keep-alive connections held open to the Fireworks API
+HTTP_POOL_SIZE = 8
+
+# On-disk cache of model completions; set CACHE_DISABLE=1 to bypass it
+COMPLETION_CACHE_PATH = Path(".cache/fireworks_cache.sqlite")
+
+# Prompt for the R1 brain. Each template has a single placeholder and is
+# filled with str.replace, which is cheaper than str.format for one field
+BRAIN_PROMPT_TEMPLATE = """Given this situation: {situation}
+
+Analyze the situation and provide two separate commands for our edge instances to execute.
+Use HTML-style tags to structure your response as follows:
+
+<thinking>
+Share your step-by-step thought process here about how you're approaching this task
+</thinking>
+
+<reasoning>
+Explain your final decision-making process here
+</reasoning>
+
+<edge1>
+Write the specific command for the first edge instance here
+</edge1>
+
+<edge2>
+Write the specific command for the second edge instance here
+</edge2>
+
+Make sure each command is clear, specific, and self-contained within its tags.
+Do not include any additional tags or thinking process in the edge commands.
+"""
+
+# Prompt shared by both V3 edge instances
+EDGE_PROMPT_TEMPLATE = """You are a V3 edge instance. Execute this command directly:
+
+{cmd}
+
+Before providing your response, briefly explain your approach:
+<thinking>Your approach</thinking>
+
+Then give your response:
+<response>Your actual output</response>
+"""
+
+def pretty_json(obj) -> str:
+    """
+    Serialize obj as JSON indented by two spaces, using orjson when available
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def compact_json(obj) -> str:
+    """
+    Serialize obj as JSON without whitespace, for embedding in prompts
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def extract_tag(text: str, tag: str) -> Optional[str]:
+    """
+    Return the stripped content of the first <tag>...</tag> block, or None
+    """
+    open_tag = f"<{tag}>"
+    start = text.find(open_tag)
+    if start < 0:
+        return None
+    start += len(open_tag)
+    end = text.find(f"</{tag}>", start)
+    if end < 0:
+        return None
+    return text[start:end].strip()
 
 # ANSI color codes
 class Colors:
@@ -16,28 +121,151 @@ class Colors:
     ENDC = '\033[0m'         # Reset
     BOLD = '\033[1m'         # Bold
     OUTPUT = '\033[38;5;214m' # Orange for outputs
+
+    # Precomputed bold prefixes
+    HEADER_PREFIX = HEADER + BOLD
+    BRAIN_PREFIX = BRAIN + BOLD
+    EDGE1_PREFIX = EDGE1 + BOLD
+    EDGE2_PREFIX = EDGE2 + BOLD
+    OUTPUT_PREFIX = OUTPUT + BOLD
+
+    # Agent label -> bold prefix, filled in on first use of a new label
+    AGENT_PREFIXES = {
+        "Brain (R1)": BRAIN_PREFIX,
+        "Edge1 (V3)": EDGE1_PREFIX,
+        "Edge2 (V3)": EDGE2_PREFIX,
+    }
     
     @staticmethod
     def wrap(color: str, text: str) -> str:
-        return f"{color}{text}{Colors.ENDC}"
+        return color + text + Colors.ENDC
+
+    @staticmethod
+    def agent_prefix(agent: str) -> str:
+        """Return the bold color prefix used for an agent label."""
+        prefix = Colors.AGENT_PREFIXES.get(agent)
+        if prefix is None:
+            if "Brain" in agent:
+                prefix = Colors.BRAIN_PREFIX
+            elif "Edge1" in agent:
+                prefix = Colors.EDGE1_PREFIX
+            else:
+                prefix = Colors.EDGE2_PREFIX
+            Colors.AGENT_PREFIXES[agent] = prefix
+        return prefix
+
+class CachedCompletion:
+    """
+    SQLite-backed cache in front of FireworksAPI.get_completion, keyed by
+    model settings and prompt
+    """
+    def __init__(self, api: FireworksAPI, cache_path: Union[str, Path] = COMPLETION_CACHE_PATH):
+        self.api = api
+        self.enabled = os.getenv("CACHE_DISABLE", "").lower() not in ("1", "true", "yes")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            cache_path = Path(cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Edge calls run in worker threads, access is serialized by _lock
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _key(model: FireworksModel, prompt: str) -> str:
+        raw = f"{model.model_id}|{model.temperature}|{model.max_tokens}|{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def lookup(self, model: FireworksModel, prompt: str) -> Optional[str]:
+        """
+        Return the cached completion for this model and prompt, if any
+        """
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM completions WHERE key = ?", (self._key(model, prompt),)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def store(self, model: FireworksModel, prompt: str, value: str):
+        """
+        Save a completion for this model and prompt
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value) VALUES (?, ?)",
+                (self._key(model, prompt), value),
+            )
+            self._conn.commit()
+
+    def get_completion(self, model: FireworksModel, prompt: str) -> Optional[str]:
+        """
+        Return a cached completion, calling the API only on a cache miss
+        """
+        cached = self.lookup(model, prompt)
+        if cached is not None:
+            return cached
+
+        value = self.api.get_completion(model, prompt)
+        # Failed calls return None and are not cached
+        if value is not None:
+            self.store(model, prompt, value)
+        return value
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 class BrainEdgeSystem:
-    def __init__(self, verbose: bool = False):
-        self.api = FireworksAPI()
+    def __init__(self, verbose: bool = False, stream_brain: bool = True):
+        # One shared session for the brain and both edge calls
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        self.api = FireworksAPI(session=self.session)
+        self.completions = CachedCompletion(self.api)
         self.brain = self.api.models["deepseek"]  # R1 model
-        self.edge_instances = [
-            self.api.models["deepseek-v3"],  # First V3 instance
-            self.api.models["deepseek-v3"]    # Second V3 instance
-        ]
+        # Both edge instances run on the same V3 model; they only differ by
+        # command, and their calls already go out concurrently
+        self.edge_model = self.api.models["deepseek-v3"]
         self.verbose = verbose
+        self.stream_brain = stream_brain
         self.thought_log = []
+        # Thought timestamps are milliseconds relative to this point
+        self._t0 = time.perf_counter()
+        self._print_buffer: List[str] = []
+        # Edge instances log from worker threads
+        self._log_lock = threading.Lock()
+        atexit.register(self.flush_logs)
+        
+    def close(self):
+        """
+        Release the pooled HTTP connections
+        """
+        # Nothing is left to flush at exit, and the hook kept this instance alive
+        atexit.unregister(self.flush_logs)
+        self.flush_logs()
+        self.completions.close()
+        self.api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
         
     def log_thought(self, agent: str, thought: str, is_output: bool = False):
         """
         Log a thought or output from an agent if verbose mode is enabled
         """
         if self.verbose:
-            timestamp = datetime.now().isoformat()
+            timestamp = f"+{int((time.perf_counter() - self._t0) * 1000)}ms"
             thought_entry = {
                 "timestamp": timestamp,
                 "agent": agent,
@@ -47,57 +275,117 @@ class BrainEdgeSystem:
             self.thought_log.append(thought_entry)
             
             # Color-coded agent names and thoughts
-            if "Brain" in agent:
-                agent_color = Colors.BRAIN
-            elif "Edge1" in agent:
-                agent_color = Colors.EDGE1
-            else:
-                agent_color = Colors.EDGE2
-                
             colored_timestamp = Colors.wrap(Colors.DIVIDER, f"[{timestamp}]")
-            colored_agent = Colors.wrap(agent_color + Colors.BOLD, agent)
+            colored_agent = Colors.wrap(Colors.agent_prefix(agent), agent)
             
             if is_output:
-                colored_type = Colors.wrap(Colors.OUTPUT + Colors.BOLD, "output: ")
+                colored_type = Colors.wrap(Colors.OUTPUT_PREFIX, "output: ")
                 colored_content = Colors.wrap(Colors.OUTPUT, thought)
             else:
                 colored_type = Colors.wrap(Colors.THINKING, "thinking: ")
                 colored_content = Colors.wrap(Colors.RESPONSE, thought)
             
-            print(f"\n{colored_timestamp} {colored_agent} {colored_type}{colored_content}")
+            line = f"\n{colored_timestamp} {colored_agent} {colored_type}{colored_content}\n"
+            with self._log_lock:
+                self._print_buffer.append(line)
+            if len(self._print_buffer) >= LOG_FLUSH_THRESHOLD:
+                self.flush_logs()
+
+    def flush_logs(self):
+        """
+        Write any buffered thought log lines to stdout in a single call
+        """
+        with self._log_lock:
+            if not self._print_buffer:
+                return
+            text = "".join(self._print_buffer)
+            self._print_buffer.clear()
+        sys.stdout.write(text)
+        sys.stdout.flush()
         
     def brain_decide(self, situation: str) -> str:
         """
         Use R1 to analyze situation and decide what commands to send to V3 instances
         """
-        self.log_thought("Brain (R1)", f"Analyzing situation: {situation}")
+        if self.verbose:
+            self.log_thought("Brain (R1)", f"Analyzing situation: {situation}")
+        return self._brain_completion(situation)
+
+    def _brain_completion(self, situation: str) -> str:
+        """
+        Get R1's full (non-streamed) response for situation
+        """
+        prompt = BRAIN_PROMPT_TEMPLATE.replace("{situation}", situation)
         
-        prompt = f"""Given this situation: {situation}
+        response = self.completions.get_completion(self.brain, prompt) or ""
+        self.log_thought("Brain (R1)", "Generated response with commands for edge instances")
+        return response
+
+    async def brain_decide_streaming(self, situation: str, pending: Dict[str, asyncio.Task]) -> str:
+        """
+        Stream R1's response and start each edge instance as soon as its
+        command tag closes. Started edge calls are added to pending, keyed
+        like the parsed decisions.
+        """
+        prompt = BRAIN_PROMPT_TEMPLATE.replace("{situation}", situation)
+        if self.completions.lookup(self.brain, prompt) is not None:
+            return await asyncio.to_thread(self.brain_decide, situation)
 
-        Analyze the situation and provide two separate commands for our edge instances to execute.
-        Use HTML-style tags to structure your response as follows:
+        if self.verbose:
+            self.log_thought("Brain (R1)", f"Analyzing situation: {situation}")
 
-        <thinking>
-        Share your step-by-step thought process here about how you're approaching this task
-        </thinking>
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
 
-        <reasoning>
-        Explain your final decision-making process here
-        </reasoning>
+        def produce() -> bool:
+            stream = self.api.stream_completion(self.brain, prompt)
+            try:
+                while True:
+                    loop.call_soon_threadsafe(deltas.put_nowait, next(stream))
+            except StopIteration as done:
+                # The stream's return value says whether it finished
+                return bool(done.value)
+            finally:
+                loop.call_soon_threadsafe(deltas.put_nowait, None)
 
-        <edge1>
-        Write the specific command for the first edge instance here
-        </edge1>
+        producer = asyncio.create_task(asyncio.to_thread(produce))
+        # Only the new text, plus enough overlap for a split tag, is scanned
+        overlap = max(len(f"</{tag}>") for tag, _ in EDGE_TAGS)
+        response = ""
+        # Command each started edge call was given, keyed like pending
+        started: Dict[str, str] = {}
+        while (delta := await deltas.get()) is not None:
+            scan_from = max(0, len(response) - overlap)
+            response += delta
+            for idx, (tag, key) in enumerate(EDGE_TAGS):
+                if key in pending or response.find(f"</{tag}>", scan_from) < 0:
+                    continue
+                cmd = extract_tag(response, tag)
+                if cmd is not None:
+                    started[key] = cmd
+                    pending[key] = asyncio.create_task(asyncio.to_thread(self._run_edge, idx, cmd))
+        try:
+            complete = await producer
+        except Exception as e:
+            # A malformed server-sent event; treat it like a dropped stream
+            print(f"Error reading brain stream: {e}")
+            complete = False
 
-        <edge2>
-        Write the specific command for the second edge instance here
-        </edge2>
+        if not complete:
+            # A partial response must not be cached; get the full one instead.
+            # Edge calls already started from the partial text cannot be
+            # stopped, so they finish and are reused when the full response
+            # issues the same command; otherwise their results are dropped
+            self.log_thought("Brain (R1)", "Response stream broke off, requesting the full response")
+            response = await asyncio.to_thread(self._brain_completion, situation)
+            dropped = [
+                pending.pop(key) for tag, key in EDGE_TAGS
+                if key in started and extract_tag(response, tag) != started[key]
+            ]
+            await asyncio.gather(*dropped, return_exceptions=True)
+            return response
 
-        Make sure each command is clear, specific, and self-contained within its tags.
-        Do not include any additional tags or thinking process in the edge commands.
-        """
-        
-        response = self.api.get_completion(self.brain, prompt) or ""
+        self.completions.store(self.brain, prompt, response)
         self.log_thought("Brain (R1)", "Generated response with commands for edge instances")
         return response
         
@@ -106,104 +394,93 @@ class BrainEdgeSystem:
         Parse the brain's HTML-tagged response into a structured format
         """
         commands = {}
+
+        # Malformed or empty output without any tags has nothing to parse
+        if "<" not in response:
+            return commands
         
-        # Extract content between tags using regex
-        thinking_match = re.search(r'<thinking>(.*?)</thinking>', response, re.DOTALL)
-        reasoning_match = re.search(r'<reasoning>(.*?)</reasoning>', response, re.DOTALL)
-        edge1_match = re.search(r'<edge1>(.*?)</edge1>', response, re.DOTALL)
-        edge2_match = re.search(r'<edge2>(.*?)</edge2>', response, re.DOTALL)
-        
-        if thinking_match:
-            commands["thinking"] = thinking_match.group(1).strip()
+        # Extract content between tags with a plain string scan
+        for tag, key in BRAIN_TAGS:
+            content = extract_tag(response, tag)
+            if content is not None:
+                commands[key] = content
+
+        if self.verbose and "thinking" in commands:
             self.log_thought("Brain (R1)", f"Thought process: {commands['thinking']}")
             
-        if reasoning_match:
-            commands["reasoning"] = reasoning_match.group(1).strip()
-        if edge1_match:
-            commands["edge1_command"] = edge1_match.group(1).strip()
-        if edge2_match:
-            commands["edge2_command"] = edge2_match.group(1).strip()
-            
         return commands
         
     def execute_edge_commands(self, commands: Dict) -> List[str]:
         """
         Send commands to V3 edge instances and get their responses
         """
-        responses = []
-        
-        if "edge1_command" in commands:
-            self.log_thought("Edge1 (V3)", f"Executing command: {commands['edge1_command']}")
-            edge1_prompt = f"""You are a V3 edge instance. Execute this command directly:
+        return asyncio.run(self.execute_edge_commands_async(commands))
 
-            {commands['edge1_command']}
+    def _run_edge(self, idx: int, cmd: str) -> str:
+        """
+        Run one command on edge instance idx and return its output
+        """
+        agent = EDGE_AGENTS[idx]
+        if self.verbose:
+            self.log_thought(agent, f"Executing command: {cmd}")
+        prompt = EDGE_PROMPT_TEMPLATE.replace("{cmd}", cmd)
+        response = self.completions.get_completion(self.edge_model, prompt) or ""
 
-            Before providing your response, briefly explain your approach:
-            <thinking>Your approach</thinking>
+        # Parse edge thinking and response
+        if "<" in response:
+            thinking = extract_tag(response, "thinking")
+            output = extract_tag(response, "response")
+        else:
+            thinking = output = None
 
-            Then give your response:
-            <response>Your actual output</response>
-            """
-            response1 = self.api.get_completion(self.edge_instances[0], edge1_prompt)
-            
-            # Parse edge1 thinking and response
-            thinking_match = re.search(r'<thinking>(.*?)</thinking>', response1, re.DOTALL)
-            response_match = re.search(r'<response>(.*?)</response>', response1, re.DOTALL)
-            
-            if thinking_match:
-                self.log_thought("Edge1 (V3)", f"Approach: {thinking_match.group(1).strip()}")
-            
-            if response_match:
-                output = response_match.group(1).strip()
-                self.log_thought("Edge1 (V3)", output, is_output=True)
-                responses.append(output)
-            else:
-                self.log_thought("Edge1 (V3)", response1, is_output=True)
-                responses.append(response1)
-            
-        if "edge2_command" in commands:
-            self.log_thought("Edge2 (V3)", f"Executing command: {commands['edge2_command']}")
-            edge2_prompt = f"""You are a V3 edge instance. Execute this command directly:
+        if self.verbose and thinking is not None:
+            self.log_thought(agent, f"Approach: {thinking}")
 
-            {commands['edge2_command']}
+        if output is not None:
+            self.log_thought(agent, output, is_output=True)
+            return output
 
-            Before providing your response, briefly explain your approach:
-            <thinking>Your approach</thinking>
+        self.log_thought(agent, response, is_output=True)
+        return response
 
-            Then give your response:
-            <response>Your actual output</response>
-            """
-            response2 = self.api.get_completion(self.edge_instances[1], edge2_prompt)
-            
-            # Parse edge2 thinking and response
-            thinking_match = re.search(r'<thinking>(.*?)</thinking>', response2, re.DOTALL)
-            response_match = re.search(r'<response>(.*?)</response>', response2, re.DOTALL)
-            
-            if thinking_match:
-                self.log_thought("Edge2 (V3)", f"Approach: {thinking_match.group(1).strip()}")
-            
-            if response_match:
-                output = response_match.group(1).strip()
-                self.log_thought("Edge2 (V3)", output, is_output=True)
-                responses.append(output)
-            else:
-                self.log_thought("Edge2 (V3)", response2, is_output=True)
-                responses.append(response2)
-            
-        return responses
+    async def execute_edge_commands_async(self, commands: Dict, pending: Optional[Dict[str, asyncio.Task]] = None) -> List[str]:
+        """
+        Send commands to V3 edge instances concurrently and get their responses.
+        Edge calls already started while streaming the brain are reused.
+        """
+        pending = pending or {}
+        # _run_edge blocks on the API, so each call runs in a worker thread
+        calls = [
+            pending.get(key) or asyncio.to_thread(self._run_edge, idx, commands[key])
+            for idx, (_, key) in enumerate(EDGE_TAGS)
+            if key in commands
+        ]
+
+        return list(await asyncio.gather(*calls))
     
     def process_situation(self, situation: str) -> Dict:
         """
         Main method to process a situation using the brain-edge system
         """
-        # Brain (R1) decides what to do
-        brain_response = self.brain_decide(situation)
+        return asyncio.run(self.process_situation_async(situation))
+
+    async def process_situation_async(self, situation: str) -> Dict:
+        """
+        Async variant of process_situation; edge instances run concurrently
+        """
+        # Brain (R1) decides what to do; when streaming, edge calls may
+        # already be running by the time it finishes
+        pending: Dict[str, asyncio.Task] = {}
+        if self.stream_brain:
+            brain_response = await self.brain_decide_streaming(situation, pending)
+        else:
+            brain_response = await asyncio.to_thread(self.brain_decide, situation)
         
         # Parse the brain's response
         decisions = self.parse_brain_response(brain_response)
         
         # Execute commands on edge instances (V3)
-        edge_responses = self.execute_edge_commands(decisions)
+        edge_responses = await self.execute_edge_commands_async(decisions, pending)
         
         result = {
             "brain_decisions": decisions,
@@ -213,6 +490,8 @@ class BrainEdgeSystem:
         
         if self.verbose:
             result["thought_log"] = self.thought_log
+
+        self.flush_logs()
             
         return result
 
@@ -223,46 +502,45 @@ def main():
     test_situation = "We need to write a haiku on 2 different topics"
     result = system.process_situation(test_situation)
     
+    # Build the whole report first and write it out in one call
+    out: List[str] = []
+    
     # Color-coded section headers and content
-    print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Brain (R1) Raw Response:')}")
-    print(Colors.wrap(Colors.DIVIDER, "-" * 50))
-    print(Colors.wrap(Colors.BRAIN, result["raw_brain_response"]))
-    print(Colors.wrap(Colors.DIVIDER, "-" * 50))
+    out += ["\n", Colors.wrap(Colors.HEADER_PREFIX, 'Brain (R1) Raw Response:'), "\n"]
+    out += [Colors.wrap(Colors.DIVIDER, "-" * 50), "\n"]
+    out += [Colors.wrap(Colors.BRAIN, result["raw_brain_response"]), "\n"]
+    out += [Colors.wrap(Colors.DIVIDER, "-" * 50), "\n"]
     
-    print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Parsed Brain Decisions:')}")
-    parsed_decisions = json.dumps(result["brain_decisions"], indent=2)
-    print(Colors.wrap(Colors.BRAIN, parsed_decisions))
+    out += ["\n", Colors.wrap(Colors.HEADER_PREFIX, 'Parsed Brain Decisions:'), "\n"]
+    parsed_decisions = pretty_json(result["brain_decisions"])
+    out += [Colors.wrap(Colors.BRAIN, parsed_decisions), "\n"]
     
-    print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Edge (V3) Responses:')}")
+    out += ["\n", Colors.wrap(Colors.HEADER_PREFIX, 'Edge (V3) Responses:'), "\n"]
     for i, response in enumerate(result["edge_responses"], 1):
-        edge_color = Colors.EDGE1 if i == 1 else Colors.EDGE2
-        print(f"\n{Colors.wrap(edge_color + Colors.BOLD, f'Edge Instance {i}:')}")
-        print(Colors.wrap(Colors.OUTPUT, response))
+        edge_prefix = Colors.EDGE1_PREFIX if i == 1 else Colors.EDGE2_PREFIX
+        out += ["\n", Colors.wrap(edge_prefix, f'Edge Instance {i}:'), "\n"]
+        out += [Colors.wrap(Colors.OUTPUT, response), "\n"]
         
     if "thought_log" in result:
-        print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Complete Thought Log:')}")
-        print(Colors.wrap(Colors.DIVIDER, "-" * 50))
+        out += ["\n", Colors.wrap(Colors.HEADER_PREFIX, 'Complete Thought Log:'), "\n"]
+        out += [Colors.wrap(Colors.DIVIDER, "-" * 50), "\n"]
         for entry in result["thought_log"]:
             # Color-code based on agent
-            if "Brain" in entry["agent"]:
-                agent_color = Colors.BRAIN
-            elif "Edge1" in entry["agent"]:
-                agent_color = Colors.EDGE1
-            else:
-                agent_color = Colors.EDGE2
-                
             timestamp = Colors.wrap(Colors.DIVIDER, f"[{entry['timestamp']}]")
-            agent = Colors.wrap(agent_color + Colors.BOLD, entry["agent"])
+            agent = Colors.wrap(Colors.agent_prefix(entry["agent"]), entry["agent"])
             
             if entry.get("is_output", False):
-                type_label = Colors.wrap(Colors.OUTPUT + Colors.BOLD, "output: ")
+                type_label = Colors.wrap(Colors.OUTPUT_PREFIX, "output: ")
                 content = Colors.wrap(Colors.OUTPUT, entry["thought"])
             else:
                 type_label = Colors.wrap(Colors.THINKING, "thinking: ")
                 content = Colors.wrap(Colors.RESPONSE, entry["thought"])
             
-            print(f"{timestamp} {agent}:")
-            print(f"  {type_label}{content}\n")
+            out += [timestamp, " ", agent, ":\n"]
+            out += ["  ", type_label, content, "\n\n"]
+
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,52 +1,49 @@
-import cognee
-
+import argparse
 import asyncio
-from cognee.modules.search.types import SearchType
+import pathlib
 
-async def main():
-    import os
-    import pathlib
+async def main(concurrent: bool = False):
+    # cognee is slow to import; load it only once there is work to do
+    import cognee
 
     # cognee knowledge graph will be created based on the text
     # and description of these files
-    import os
-
-    raw_text = os.path.join(
-        os.path.abspath("."),
-        "data",
-        "raw_text.txt"
-    )
-
-    test_image = os.path.join(
-        os.path.abspath("."),
-        "data",
-        "test_image.png"
-    )
-
-    user_profile = os.path.join(
-        os.path.abspath("."),
-        "data",
-        "user_profile.yaml"
-    )
+    base_dir = pathlib.Path.cwd()
+    data_dir = base_dir / "data"
+    files = [
+        str(data_dir / "raw_text.txt"),
+        str(data_dir / "test_image.png"),
+        str(data_dir / "user_profile.yaml")
+    ]
 
     # Create a clean slate for cognee -- reset data and system state
     await cognee.prune.prune_data()
     await cognee.prune.prune_system(metadata=True)
-    # Add multimedia files and make them available for cognify
-    await cognee.add([raw_text, test_image,user_profile ])
+
+    if concurrent:
+        # Add each file independently so they are preprocessed in parallel;
+        # opt-in, since concurrent adds share one dataset and relational DB
+        await asyncio.gather(*(cognee.add([path]) for path in files))
+    else:
+        # Add multimedia files and make them available for cognify
+        await cognee.add(files)
 
     # Create knowledge graph with cognee
     await cognee.cognify()
-    import pathlib
     from cognee.api.v1.visualize import visualize_graph
 
     # Use the current working directory instead of __file__:
-    notebook_dir = pathlib.Path.cwd()
-
-    graph_file_path = (notebook_dir / ".artifacts" / "graph_visualization.html").resolve()
+    graph_file_path = (base_dir / ".artifacts" / "graph_visualization.html").resolve()
 
     # Make sure to convert to string if visualize_graph expects a string
     b = await visualize_graph(str(graph_file_path))
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Load local data into cognee")
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="add the files concurrently (experimental: cognee does not document concurrent adds as safe)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(concurrent=args.concurrent))
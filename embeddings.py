@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; fall back to hashlib's sha256
+    xxhash = None
+
+# On-disk cache of chunk embeddings; set CACHE_DISABLE=1 to bypass it
+EMBEDDING_CACHE_PATH = Path(".cache/embeddings.sqlite")
+# Most inputs the OpenAI embeddings endpoint accepts in one request
+MAX_INPUTS_PER_REQUEST = 2048
+# Embedding requests in flight at once; raise for higher OpenAI rate-limit tiers
+MAX_CONCURRENT_REQUESTS = 8
+# Attempts per request before a rate-limit error is raised
+MAX_RETRIES = 6
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+# One component of an OpenAI reset duration such as "1m30s" or "250ms"
+_DURATION_RE = re.compile(r"([\d.]+)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def content_key(text: str) -> str:
+    """
+    Cache key for a chunk: a hash of its whitespace-normalized text, using
+    xxh3-128 when xxhash is installed
+    """
+    data = " ".join(text.split()).encode("utf-8")
+    if xxhash is not None:
+        # Prefixed so keys never collide with sha256 keys from the same cache
+        return "xxh3:" + xxhash.xxh3_128_hexdigest(data)
+    return hashlib.sha256(data).hexdigest()
+
+def parse_duration(value: str) -> Optional[float]:
+    """Seconds in an OpenAI rate-limit reset header value, e.g. "1m30s" -> 90.0."""
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a rate-limited request: the server's
+    Retry-After or reset hint when present, else jittered exponential backoff
+    """
+    response = getattr(error, "response", None)
+    headers = response.headers if response is not None else {}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    hints = [
+        parse_duration(headers[name])
+        for name in ("x-ratelimit-reset-tokens", "x-ratelimit-reset-requests")
+        if headers.get(name)
+    ]
+    hints = [hint for hint in hints if hint is not None]
+    if hints:
+        return max(hints)
+    return min(60.0, 2 ** attempt) * (0.5 + random.random() / 2)
+
+class EmbeddingCache:
+    """
+    SQLite-backed store of embedding vectors, keyed by model and chunk
+    content hash
+    """
+    def __init__(self, cache_path: Union[str, Path] = EMBEDDING_CACHE_PATH):
+        self.enabled = os.getenv("CACHE_DISABLE", "").lower() not in ("1", "true", "yes")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            cache_path = Path(cache_path)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Async imports embed from worker threads, access is serialized by _lock
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT, key TEXT, vector BLOB, PRIMARY KEY (model, key))"
+            )
+            self._conn.commit()
+
+    def lookup(self, model: str, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever keys are present."""
+        if self._conn is None:
+            return {}
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = keys[start:start + _SQL_BATCH]
+                rows = self._conn.execute(
+                    "SELECT key, vector FROM embeddings WHERE model = ? AND key IN "
+                    f"({', '.join('?' * len(batch))})",
+                    (model, *batch),
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def store(self, model: str, items: Iterable[Tuple[str, np.ndarray]]):
+        """Save (key, vector) pairs for model."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                ((model, key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items),
+            )
+            self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+class ChunkEmbedder:
+    """Embeds chunks with an OpenAI model, only sending chunks not already cached."""
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = MAX_INPUTS_PER_REQUEST,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ):
+        # Imported here so the OpenAI SDK is only needed when chunks are embedded locally
+        import openai
+
+        self.client = openai.OpenAI(api_key=api_key)
+        self._async_client: Optional["openai.AsyncOpenAI"] = None
+        self._api_key = api_key
+        self._rate_limit_error = openai.RateLimitError
+        self.model = model
+        self.batch_size = min(batch_size, MAX_INPUTS_PER_REQUEST)
+        self.max_concurrency = max_concurrency
+        self.cache = cache if cache is not None else EmbeddingCache()
+
+    def _misses(self, keys: List[str], texts: Sequence[str], vectors: Dict[str, np.ndarray]) -> List[List[Tuple[str, str]]]:
+        """Group uncached (key, text) pairs into requests; identical chunks are embedded once."""
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        items = list(missing.items())
+        return [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+
+    def _store(self, batch: List[Tuple[str, str]], data) -> Dict[str, np.ndarray]:
+        new_vectors = {
+            key: np.asarray(item.embedding, dtype=np.float32)
+            for (key, _), item in zip(batch, sorted(data, key=lambda item: item.index))
+        }
+        self.cache.store(self.model, new_vectors.items())
+        return new_vectors
+
+    def _create(self, batch: List[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = self.client.embeddings.create(model=self.model, input=[text for _, text in batch])
+                return self._store(batch, response.data)
+            except self._rate_limit_error as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                time.sleep(retry_delay(e, attempt))
+
+    async def _acreate(self, batch: List[Tuple[str, str]], semaphore: asyncio.Semaphore) -> Dict[str, np.ndarray]:
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with semaphore:
+                    response = await self._async_client.embeddings.create(
+                        model=self.model, input=[text for _, text in batch]
+                    )
+                return self._store(batch, response.data)
+            except self._rate_limit_error as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                # Back off without holding a slot, so other requests can proceed
+                await asyncio.sleep(retry_delay(e, attempt))
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """Return one float32 vector per text, in order."""
+        keys = [content_key(text) for text in texts]
+        vectors = self.cache.lookup(self.model, set(keys))
+        batches = self._misses(keys, texts, vectors)
+        if len(batches) == 1:
+            vectors.update(self._create(batches[0]))
+        elif batches:
+            # Requests are network-bound, so send several at once
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                for new_vectors in executor.map(self._create, batches):
+                    vectors.update(new_vectors)
+        return [vectors[key] for key in keys]
+
+    async def aembed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """Async version of embed, with at most max_concurrency requests in flight."""
+        if self._async_client is None:
+            import openai
+            self._async_client = openai.AsyncOpenAI(api_key=self._api_key)
+        keys = [content_key(text) for text in texts]
+        vectors = self.cache.lookup(self.model, set(keys))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._acreate(batch, semaphore) for batch in self._misses(keys, texts, vectors)))
+        for new_vectors in results:
+            vectors.update(new_vectors)
+        return [vectors[key] for key in keys]
+
+    def close(self):
+        self.cache.close()
@@ -1,6 +1,7 @@
 import os
 import logging
-from typing import List, Dict, Any
+from collections import deque
+from typing import Dict, Any, Iterator
 import yaml
 from pathlib import Path
 import weaviate
@@ -8,10 +9,19 @@ from weaviate.classes.init import Auth
 from weaviate.classes import config
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml; use the pure-Python loader
+    from yaml import SafeLoader as YamlLoader
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Batch settings for Weaviate ingestion
+BATCH_SIZE = 200
+CONCURRENT_REQUESTS = 4
+
 def load_environment():
     """Load environment variables."""
     load_dotenv()
@@ -82,23 +92,34 @@ def create_document_collection(client: weaviate.WeaviateClient) -> weaviate.coll
         generative_config=config.Configure.Generative.openai()
     )
 
-def chunk_text(text: str, chunk_size: int = 150, overlap: int = 25) -> List[str]:
-    """Chunk text into smaller pieces."""
-    words = text.split()
-    chunks = []
+def stream_chunks(path: str, chunk_size: int = 150, overlap: int = 25) -> Iterator[str]:
+    """Chunk a text file line by line, holding at most one chunk of words in memory."""
+    stride = chunk_size - overlap
+    window = deque(maxlen=chunk_size)
+    count = 0
     
-    for i in range(0, len(words), chunk_size - overlap):
-        chunk = " ".join(words[i:i + chunk_size])
-        chunks.append(chunk)
+    with open(path, 'r') as f:
+        for line in f:
+            for word in line.split():
+                window.append(word)
+                count += 1
+                # The chunk starting at the last stride boundary is now full
+                if count >= chunk_size and (count - chunk_size) % stride == 0:
+                    yield " ".join(window)
     
-    return chunks
+    # Flush the chunks that start before the end of the file but never filled up
+    words = list(window)
+    offset = count - len(words)
+    first = 0 if count < chunk_size else ((count - chunk_size) // stride + 1) * stride
+    for i in range(first, count, stride):
+        yield " ".join(words[i - offset:])
 
 def load_user_profiles(collection: weaviate.collections.Collection, yaml_path: str):
     """Load user profiles from YAML file."""
     with open(yaml_path, 'r') as f:
-        profiles = yaml.safe_load(f)
+        profiles = yaml.load(f, Loader=YamlLoader)
     
-    with collection.batch.dynamic() as batch:
+    with collection.batch.fixed_size(batch_size=BATCH_SIZE, concurrent_requests=CONCURRENT_REQUESTS) as batch:
         for profile in profiles:
             batch.add_object(
                 properties=profile
@@ -107,21 +128,20 @@ def load_user_profiles(collection: weaviate.collections.Collection, yaml_path: s
 
 def load_text_document(collection: weaviate.collections.Collection, text_path: str):
     """Load and chunk text document."""
-    with open(text_path, 'r') as f:
-        text = f.read()
-    
-    chunks = chunk_text(text)
+    title = Path(text_path).stem
+    count = 0
     
-    with collection.batch.dynamic() as batch:
-        for i, chunk in enumerate(chunks):
+    with collection.batch.fixed_size(batch_size=BATCH_SIZE, concurrent_requests=CONCURRENT_REQUESTS) as batch:
+        for i, chunk in enumerate(stream_chunks(text_path)):
             batch.add_object(
                 properties={
                     "content": chunk,
-                    "title": Path(text_path).stem,
+                    "title": title,
                     "chunk_index": i
                 }
             )
-    logger.info(f"Loaded {len(chunks)} text chunks")
+            count += 1
+    logger.info(f"Loaded {count} text chunks")
 
 def main():
     """Main execution function."""
@@ -1,13 +1,90 @@
-from brain_edge_interaction import BrainEdgeSystem, Colors
+from brain_edge_interaction import BrainEdgeSystem, Colors, compact_json, pretty_json
 from weaviate_rag_example import WeaviateClient, WeaviateConfig, load_environment
-from typing import Dict, List, Optional, Union
-import json
-import yaml
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import os
+import pickle
+import re
+import numpy as np
 import requests
 from pathlib import Path
 
+# Local data files and the pickle cache of their parsed contents
+USER_PROFILES_PATH = Path("data/user_profile.yaml")
+LISTINGS_PATH = Path("data/raw_text.txt")
+LOCAL_DATA_CACHE_PATH = Path("data/.cache.pkl")
+# Bump when the cached structures change shape
+LOCAL_DATA_CACHE_VERSION = 2
+
+# Classifies a stripped listing line in one match; alternatives are tried in
+# order, so a line containing both "bed" and "bath" counts as bedrooms
+LISTING_LINE_RE = re.compile(
+    r"(?P<price>\$)"
+    r"|(?P<bedrooms>.*(?i:bed))"
+    r"|(?P<bathrooms>.*(?i:bath))"
+    r"|(?P<location>.*San Francisco, CA)"
+    r"|(?P<pet_friendly>.*PET FRIENDLY)"
+    r"|(?P<description>Description)"
+)
+
+# Tokens used to index listings and split search queries
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# First dollar amount in a listing's price line; ranges use their low end
+PRICE_RE = re.compile(r"\$\s*([\d,]+(?:\.\d+)?)")
+# Price caps in queries, e.g. "under $4000", "below $3,500", "up to 3.5k"; the
+# amount needs a $ or a k so "under 10 minutes" or "up to 2 bedrooms" is not a cap
+PRICE_CAP_RE = re.compile(
+    r"\b(?:under|below|less than|up to|max)\s*(?=\$|[\d,.]+k\b)\$?\s*([\d,]+(?:\.\d+)?)(k?)\b",
+    re.IGNORECASE,
+)
+# Query words that match nearly every listing and carry no signal
+QUERY_STOPWORDS = frozenset({"the", "a", "an", "and", "or", "for", "of", "in", "to", "is", "i", "my"})
+
+# Situation prompts for the brain, filled with str.format_map per query
+_SITUATION_HEAD = """Given this user query: "{query}"
+
+Available apartment listings from our local database:
+
+{context_str}
+
+"""
+_SITUATION_TASKS = """
+Based on this information, analyze the context and create specific tasks for our edge instances.
+The first edge instance should focus on analyzing and extracting key information from the listings, including:
+- Prices and availability
+- Location details
+- Amenities and features
+- Pet policies
+- Any special offers
+
+The second edge instance should focus on:
+"""
+_SITUATION_TAIL = """
+
+Remember: You are the brain (R1) coordinating two edge instances (V3).
+"""
+SITUATION_TEMPLATE_WITH_PROFILE = (
+    _SITUATION_HEAD
+    + "User Profile Information:\n{user_json}\n"
+    + _SITUATION_TASKS
+    + "- Matching the listings with the user's preferences and providing personalized recommendations"
+    + _SITUATION_TAIL
+)
+SITUATION_TEMPLATE = (
+    _SITUATION_HEAD
+    + "\n\n"
+    + _SITUATION_TASKS
+    + "- Generating a comprehensive summary and recommendations based on the listings"
+    + _SITUATION_TAIL
+)
+
 class DataLoader:
     """Handles loading data from local files and URLs."""
+
+    def __init__(self):
+        # Shared session so repeat downloads reuse keep-alive connections
+        self._session = requests.Session()
+        # url -> (ETag, lines) for conditional re-fetches of unchanged URLs
+        self._etag_cache: Dict[str, Tuple[str, List[str]]] = {}
     
     @staticmethod
     def load_text_file(file_path: Union[str, Path]) -> str:
@@ -15,18 +92,69 @@ class DataLoader:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
             
+    @staticmethod
+    def iter_text_lines(file_path: Union[str, Path]) -> Iterator[str]:
+        """Yield lines from a local text file without reading it all into memory."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield from f
+            
     @staticmethod
     def load_yaml_file(file_path: Union[str, Path]) -> List[Dict]:
         """Load YAML data from a local file."""
+        # Imported here so startups served from the parsed-data cache skip PyYAML
+        import yaml
+        try:
+            from yaml import CSafeLoader as YamlLoader
+        except ImportError:  # PyYAML built without libyaml; use the pure-Python loader
+            from yaml import SafeLoader as YamlLoader
         with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=YamlLoader)
             
-    @staticmethod
-    def load_from_url(url: str) -> str:
-        """Load text data from a URL."""
-        response = requests.get(url)
+    def load_from_url(self, url: str) -> Iterator[str]:
+        """Stream text data from a URL line by line."""
+        headers = {}
+        cached = self._etag_cache.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+            
+        response = self._session.get(url, headers=headers, stream=True, timeout=10)
+        if cached and response.status_code == 304:
+            response.close()
+            return iter(cached[1])
         response.raise_for_status()
-        return response.text
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+            
+        lines = self._iter_response_lines(response)
+        etag = response.headers.get("ETag")
+        return self._remember_lines(url, etag, lines) if etag else lines
+
+    @staticmethod
+    def _iter_response_lines(response: requests.Response) -> Iterator[str]:
+        """
+        Split a streamed response on "\n", carrying partial lines across reads.
+        iter_lines yields a spurious blank line when a \r\n straddles two reads,
+        and blank lines separate listings; a trailing \r is left for strip().
+        """
+        pending = ""
+        for text in response.iter_content(chunk_size=65536, decode_unicode=True):
+            lines = (pending + text).split("\n")
+            pending = lines.pop()
+            yield from lines
+        if pending:
+            yield pending
+
+    def _remember_lines(self, url: str, etag: str, lines: Iterator[str]) -> Iterator[str]:
+        """Pass lines through, caching them under the ETag once fully read."""
+        seen = []
+        for line in lines:
+            seen.append(line)
+            yield line
+        self._etag_cache[url] = (etag, seen)
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self._session.close()
 
 class RAGBrainEdgeSystem:
     def __init__(self, verbose: bool = True):
@@ -41,57 +169,170 @@ class RAGBrainEdgeSystem:
         self.load_local_data()
         
     def load_local_data(self):
-        """Load data from local files."""
+        """Load data from local files, reusing the parsed cache when they are unchanged."""
         try:
-            # Load user profiles
-            self.user_profiles = self.data_loader.load_yaml_file("data/user_profile.yaml")
-            
-            # Load apartment listings
-            self.apartment_data = self.data_loader.load_text_file("data/raw_text.txt")
-            
-            # Process apartment data into structured format
-            self.apartment_listings = self._process_apartment_data(self.apartment_data)
-            
-            self._log("Successfully loaded local data files", Colors.HEADER)
+            cache_key = (
+                LOCAL_DATA_CACHE_VERSION,
+                os.path.getmtime(USER_PROFILES_PATH),
+                os.path.getmtime(LISTINGS_PATH),
+            )
+            if self._load_data_cache(cache_key):
+                self._log("Loaded local data from cache", Colors.HEADER)
+            else:
+                # Load user profiles
+                self.user_profiles = self.data_loader.load_yaml_file(USER_PROFILES_PATH)
+                
+                # Stream apartment listings into structured format
+                self.apartment_listings = []
+                self._listing_json = []
+                self._postings = {}
+                lines = self.data_loader.iter_text_lines(LISTINGS_PATH)
+                self._index_listings(self._process_apartment_data(lines))
+
+                self._save_data_cache(cache_key)
+                self._log("Successfully loaded local data files", Colors.HEADER)
+
+            self._profiles_by_email = {profile["email"]: profile for profile in self.user_profiles}
+            # Array forms of the index and listing columns, rebuilt on the first query
+            self._csr = None
+            self._columns = None
         except Exception as e:
             self._log(f"Error loading local data: {str(e)}", Colors.HEADER)
             raise
 
-    def _process_apartment_data(self, raw_data: str) -> List[Dict]:
-        """Process raw apartment data into structured format."""
-        # Split the raw text into individual listings
+    def _load_data_cache(self, cache_key: tuple) -> bool:
+        """Restore parsed data from the pickle cache if it matches cache_key."""
+        # Any failure, e.g. a stale pickle naming classes that moved, is a miss
+        try:
+            with open(LOCAL_DATA_CACHE_PATH, 'rb') as f:
+                cached = pickle.load(f)
+            if not isinstance(cached, dict) or cached.get("key") != cache_key:
+                return False
+            data = (cached["user_profiles"], cached["apartment_listings"], cached["listing_json"], cached["postings"])
+        except Exception:
+            return False
+        self.user_profiles, self.apartment_listings, self._listing_json, self._postings = data
+        return True
+
+    def _save_data_cache(self, cache_key: tuple):
+        """Write parsed data to the pickle cache; failures only cost the next startup."""
+        cached = {
+            "key": cache_key,
+            "user_profiles": self.user_profiles,
+            "apartment_listings": self.apartment_listings,
+            "listing_json": self._listing_json,
+            "postings": self._postings,
+        }
+        tmp_path = LOCAL_DATA_CACHE_PATH.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, LOCAL_DATA_CACHE_PATH)
+        except OSError as e:
+            self._log(f"Could not write local data cache: {str(e)}", Colors.HEADER)
+
+    @staticmethod
+    def _classify_line(line: str) -> Optional[Tuple[str, Union[str, bool]]]:
+        """Map a stripped listing line to the (field, value) it describes, if any."""
+        match = LISTING_LINE_RE.match(line)
+        if match is None:
+            return None
+        key = match.lastgroup
+        return key, (True if key == 'pet_friendly' else line)
+
+    def _process_apartment_data(self, lines: Iterable[str]) -> List[Dict]:
+        """Process raw apartment data lines into structured format."""
+        # Listings are separated by blank lines
         # This is a simple implementation - you might want to enhance this based on your data structure
         listings = []
         current_listing = {}
-        lines = raw_data.split('\n')
         
         for line in lines:
             line = line.strip()
             if not line:
                 if current_listing:
-                    listings.append(current_listing.copy())
+                    listings.append(current_listing)
                     current_listing = {}
                 continue
                 
             # Basic parsing of key information
-            if line.startswith('$'):
-                current_listing['price'] = line
-            elif 'bed' in line.lower():
-                current_listing['bedrooms'] = line
-            elif 'bath' in line.lower():
-                current_listing['bathrooms'] = line
-            elif 'San Francisco, CA' in line:
-                current_listing['location'] = line
-            elif 'PET FRIENDLY' in line:
-                current_listing['pet_friendly'] = True
-            elif line.startswith('Description'):
-                current_listing['description'] = line
+            field = self._classify_line(line)
+            if field is not None:
+                key, value = field
+                current_listing[key] = value
                 
         if current_listing:
             listings.append(current_listing)
             
         return listings
 
+    def _index_listings(self, listings: List[Dict]):
+        """
+        Append listings, their compact JSON, and add them to the token -> listing
+        index map used by _filter_listings, so queries never rescan listing text.
+        """
+        for listing in listings:
+            doc_id = len(self.apartment_listings)
+            self.apartment_listings.append(listing)
+            # Prompt form of the listing, serialized once
+            self._listing_json.append(compact_json(listing))
+            # Keys are searchable too, e.g. "pet friendly" hits the pet_friendly flag
+            search_text = " ".join(f"{key} {value}" for key, value in listing.items()).lower()
+            for token in set(TOKEN_RE.findall(search_text)):
+                self._postings.setdefault(token, []).append(doc_id)
+        self._csr = None
+        self._columns = None
+
+    def _build_csr(self):
+        """
+        Pack the posting lists into CSR arrays: listing ids for term t are
+        postings_flat[term_offsets[t]:term_offsets[t + 1]].
+        """
+        term_ids = {}
+        lengths = []
+        for term_id, (term, doc_ids) in enumerate(self._postings.items()):
+            term_ids[term] = term_id
+            lengths.append(len(doc_ids))
+        term_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=term_offsets[1:])
+        postings_flat = np.fromiter(
+            (doc_id for doc_ids in self._postings.values() for doc_id in doc_ids),
+            dtype=np.int32,
+            count=int(term_offsets[-1]),
+        )
+        self._csr = (term_ids, postings_flat, term_offsets)
+
+    def _build_columns(self):
+        """
+        Pull the filterable fields into column arrays (price, pet friendly),
+        so query constraints become vectorized masks instead of dict walks.
+        """
+        prices = np.full(len(self.apartment_listings), np.nan)
+        pet_friendly = np.zeros(len(self.apartment_listings), dtype=bool)
+        for doc_id, listing in enumerate(self.apartment_listings):
+            match = PRICE_RE.search(listing.get("price", ""))
+            if match:
+                prices[doc_id] = float(match.group(1).replace(",", ""))
+            pet_friendly[doc_id] = listing.get("pet_friendly", False)
+        self._columns = (prices, pet_friendly)
+
+    def _constraint_mask(self, query: str, terms: set) -> Optional[np.ndarray]:
+        """Boolean mask of listings meeting the query's price and pet constraints, if any."""
+        mask = None
+        cap = PRICE_CAP_RE.search(query)
+        if cap or terms & {"pet", "pets"}:
+            if self._columns is None:
+                self._build_columns()
+            prices, pet_friendly = self._columns
+            mask = np.ones(len(prices), dtype=bool)
+            if cap:
+                max_price = float(cap.group(1).replace(",", "")) * (1000 if cap.group(2) else 1)
+                # NaN prices compare False, so unpriced listings get no boost
+                mask &= prices <= max_price
+            if terms & {"pet", "pets"}:
+                mask &= pet_friendly
+        return mask
+
     def _log(self, message: str, color: str = Colors.RESPONSE):
         """Helper method for logging if verbose is enabled."""
         if self.verbose:
@@ -99,10 +340,7 @@ class RAGBrainEdgeSystem:
 
     def get_user_context(self, user_email: str) -> Optional[Dict]:
         """Get user profile context for personalization."""
-        for profile in self.user_profiles:
-            if profile["email"] == user_email:
-                return profile
-        return None
+        return self._profiles_by_email.get(user_email)
 
     def process_query_with_context(self, user_query: str, user_email: Optional[str] = None, num_results: int = 3) -> Dict:
         """
@@ -112,37 +350,24 @@ class RAGBrainEdgeSystem:
         user_context = self.get_user_context(user_email) if user_email else None
         
         # Filter relevant listings based on the query
-        relevant_listings = self._filter_listings(user_query, num_results)
+        relevant_ids = self._filter_listing_ids(user_query, num_results)
+        relevant_listings = [self.apartment_listings[doc_id] for doc_id in relevant_ids]
         
-        # Format listings for the brain
+        # Format listings for the brain; compact JSON keeps the prompt short
         context_str = "\n\n".join([
-            f"Listing {i+1}:\n{json.dumps(listing, indent=2)}"
-            for i, listing in enumerate(relevant_listings)
+            f"Listing {i+1}:\n{self._listing_json[doc_id]}"
+            for i, doc_id in enumerate(relevant_ids)
         ])
 
-        # Create situation prompt for the brain
-        situation = f"""Given this user query: "{user_query}"
-
-Available apartment listings from our local database:
-
-{context_str}
-
-{"User Profile Information:" if user_context else ""}
-{json.dumps(user_context, indent=2) if user_context else ""}
-
-Based on this information, analyze the context and create specific tasks for our edge instances.
-The first edge instance should focus on analyzing and extracting key information from the listings, including:
-- Prices and availability
-- Location details
-- Amenities and features
-- Pet policies
-- Any special offers
-
-The second edge instance should focus on:
-{"- Matching the listings with the user's preferences and providing personalized recommendations" if user_context else "- Generating a comprehensive summary and recommendations based on the listings"}
-
-Remember: You are the brain (R1) coordinating two edge instances (V3).
-"""
+        # Fill the situation prompt for the brain
+        if user_context:
+            situation = SITUATION_TEMPLATE_WITH_PROFILE.format_map({
+                "query": user_query,
+                "context_str": context_str,
+                "user_json": compact_json(user_context),
+            })
+        else:
+            situation = SITUATION_TEMPLATE.format_map({"query": user_query, "context_str": context_str})
 
         # Process with brain-edge system
         self._log("\nProcessing with Brain-Edge system...", Colors.HEADER)
@@ -160,31 +385,61 @@ Remember: You are the brain (R1) coordinating two edge instances (V3).
         Filter apartment listings based on the query.
         This is a simple implementation - you might want to enhance this with better search logic.
         """
-        query = query.lower()
-        filtered = []
+        return [self.apartment_listings[doc_id] for doc_id in self._filter_listing_ids(query, limit)]
+
+    @staticmethod
+    def _query_terms(query: str) -> set:
+        """Distinct search terms in a query, without stopwords or stray letters."""
+        return {
+            term for term in TOKEN_RE.findall(query.lower())
+            if term not in QUERY_STOPWORDS and (len(term) > 1 or term.isdigit())
+        }
+
+    def _filter_listing_ids(self, query: str, limit: int) -> List[int]:
+        """Return the indices of the best matching listings, best first."""
+        if limit <= 0:
+            return []
+        if self._csr is None:
+            self._build_csr()
+        term_ids, postings_flat, term_offsets = self._csr
         
-        for listing in self.apartment_listings:
-            score = 0
-            listing_str = json.dumps(listing).lower()
-            
-            # Simple scoring based on query terms
-            for term in query.split():
-                if term in listing_str:
-                    score += 1
-                    
-            if score > 0:
-                filtered.append((score, listing))
-                
-        # Sort by score and return top results
-        filtered.sort(key=lambda x: x[0], reverse=True)
-        return [listing for score, listing in filtered[:limit]]
+        terms = self._query_terms(query)
+        
+        # Simple scoring: one point per distinct query term found in the listing
+        hits = [
+            postings_flat[term_offsets[term_id]:term_offsets[term_id + 1]]
+            for term_id in (term_ids.get(term) for term in terms)
+            if term_id is not None
+        ]
+        mask = self._constraint_mask(query, terms)
+        if not hits and mask is None:
+            return []
+        scores = np.bincount(
+            np.concatenate(hits) if hits else np.empty(0, dtype=np.int32),
+            minlength=len(self.apartment_listings),
+        )
+        if mask is not None:
+            # Listings meeting every constraint earn a point; the rest keep
+            # their term score, so a constraint never hides a listing
+            scores = scores + mask
+        candidates = np.flatnonzero(scores)
+        
+        # Keep the top `limit` without sorting every hit; ties keep listing order
+        if len(candidates) > limit:
+            candidate_scores = scores[candidates]
+            kth = np.partition(candidate_scores, len(candidates) - limit)[len(candidates) - limit]
+            above = candidates[candidate_scores > kth]
+            ties = candidates[candidate_scores == kth][:limit - len(above)]
+            candidates = np.concatenate([above, ties])
+        top = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return top.tolist()
 
     def add_url_data(self, url: str):
         """Add data from a URL to the existing dataset."""
         try:
             new_data = self.data_loader.load_from_url(url)
             new_listings = self._process_apartment_data(new_data)
-            self.apartment_listings.extend(new_listings)
+            self._index_listings(new_listings)
             self._log(f"Successfully added {len(new_listings)} listings from URL", Colors.HEADER)
         except Exception as e:
             self._log(f"Error loading data from URL: {str(e)}", Colors.HEADER)
@@ -242,7 +497,7 @@ def main():
         print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Retrieved Listings:')}")
         for i, listing in enumerate(result["listings"], 1):
             print(f"\n{Colors.wrap(Colors.THINKING, f'Listing {i}:')}")
-            print(Colors.wrap(Colors.RESPONSE, json.dumps(listing, indent=2)))
+            print(Colors.wrap(Colors.RESPONSE, pretty_json(listing)))
 
         print(f"\n{Colors.wrap(Colors.HEADER + Colors.BOLD, 'Brain Analysis:')}")
         if "thinking" in result["brain_decisions"]:
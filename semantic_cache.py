@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bits in an LSH signature, one random hyperplane per bit
+SIGNATURE_BITS = 64
+# Set bits per byte value, for popcounts on signature bytes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Scale a vector into int8 by its largest magnitude; returns (codes, scale)."""
+    max_abs = float(np.abs(vector).max()) if len(vector) else 0.0
+    scale = max_abs / 127 if max_abs else 1.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+def unit(vector: Sequence[float]) -> np.ndarray:
+    """Return vector as a float32 array scaled to unit length."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+def hamming_distances(signatures: np.ndarray, signature: np.uint64) -> np.ndarray:
+    """Bit differences between each uint64 signature and one query signature."""
+    diff = np.bitwise_xor(signatures, signature)
+    return _POPCOUNT[diff.view(np.uint8)].reshape(len(diff), 8).sum(axis=1, dtype=np.int32)
+
+class SemanticCache:
+    """
+    In-process cache of query answers, matched by cosine similarity of the
+    query embeddings rather than exact text. Callers pass the embedding they
+    already computed for the search, so the cache adds no embedding calls.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.93,
+        ttl: float = 3600.0,
+        max_entries: int = 10000,
+        lsh_min_entries: int = 1024,
+        seed: int = 0,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Unit-norm query embeddings quantized to int8 with a scale per row,
+        # one row per entry, grown by doubling
+        self._keys: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._namespaces = np.zeros(0, dtype=np.int32)
+        self._expires = np.zeros(0, dtype=np.float64)
+        self._values: list = []
+        self._size = 0
+        self._namespace_ids: Dict[Hashable, int] = {}
+        # Random-projection signatures prune candidates once the cache holds
+        # lsh_min_entries; smaller caches are cheap to scan exactly
+        self.lsh_min_entries = lsh_min_entries
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None
+        self._signatures = np.zeros(0, dtype=np.uint64)
+        # Two vectors at angle theta differ in about bits * theta / pi signature
+        # bits; allow twice that for matches at the threshold
+        angle = np.arccos(np.clip(threshold, -1.0, 1.0))
+        self.max_hamming = int(np.ceil(2 * SIGNATURE_BITS * angle / np.pi))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _signature(self, vector: np.ndarray) -> np.uint64:
+        bits = np.packbits(vector @ self._planes > 0)
+        return bits.view(np.uint64)[0]
+
+    def lookup(self, embedding: Sequence[float], namespace: Hashable = "default") -> Optional[Any]:
+        """Return the answer cached for a query with a similar embedding in namespace, if any."""
+        namespace_id = self._namespace_ids.get(namespace)
+        if namespace_id is None or not self._size:
+            return None
+        vector = unit(embedding)
+        with self._lock:
+            size = self._size
+            # Entries from other namespaces or past their TTL never match
+            live = (self._namespaces[:size] == namespace_id) & (self._expires[:size] > time.monotonic())
+            if size >= self.lsh_min_entries:
+                live &= hamming_distances(self._signatures[:size], self._signature(vector)) <= self.max_hamming
+            candidates = np.flatnonzero(live)
+            if not len(candidates):
+                return None
+            # Integer dot products accumulate in int32, then rescale to cosines
+            codes, scale = quantize(vector)
+            sims = (self._keys[candidates].astype(np.int32) @ codes.astype(np.int32)) * (self._scales[candidates] * scale)
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                return self._values[candidates[best]]
+        return None
+
+    def insert(self, embedding: Sequence[float], value: Any, namespace: Hashable = "default"):
+        """Cache value as the answer to the query with this embedding in namespace."""
+        vector = unit(embedding)
+        with self._lock:
+            if self._size >= self.max_entries:
+                self._evict()
+            if self._keys is None:
+                self._keys = np.zeros((16, len(vector)), dtype=np.int8)
+                self._scales = np.zeros(16, dtype=np.float32)
+                self._namespaces = np.zeros(16, dtype=np.int32)
+                self._expires = np.zeros(16, dtype=np.float64)
+                self._signatures = np.zeros(16, dtype=np.uint64)
+                self._planes = self._rng.standard_normal((len(vector), SIGNATURE_BITS)).astype(np.float32)
+            if self._size == len(self._keys):
+                self._grow(min(2 * self._size, self.max_entries))
+            namespace_id = self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+            index = self._size
+            self._keys[index], self._scales[index] = quantize(vector)
+            self._namespaces[index] = namespace_id
+            self._expires[index] = time.monotonic() + self.ttl
+            self._signatures[index] = self._signature(vector)
+            self._values.append(value)
+            self._size += 1
+
+    def _grow(self, capacity: int):
+        keys = np.zeros((capacity, self._keys.shape[1]), dtype=np.int8)
+        keys[:self._size] = self._keys[:self._size]
+        self._keys = keys
+        self._namespaces = np.resize(self._namespaces, capacity)
+        self._scales = np.resize(self._scales, capacity)
+        self._expires = np.resize(self._expires, capacity)
+        self._signatures = np.resize(self._signatures, capacity)
+
+    def _evict(self):
+        """Drop expired entries, or the oldest quarter if none have expired."""
+        size = self._size
+        keep = self._expires[:size] > time.monotonic()
+        if keep.all():
+            keep[:max(1, size // 4)] = False
+        kept = np.flatnonzero(keep)
+        count = len(kept)
+        self._keys[:count] = self._keys[kept]
+        self._namespaces[:count] = self._namespaces[kept]
+        self._scales[:count] = self._scales[kept]
+        self._expires[:count] = self._expires[kept]
+        self._signatures[:count] = self._signatures[kept]
+        self._values = [self._values[i] for i in kept.tolist()]
+        self._size = count
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._values = []
+            self._size = 0
@@ -15,6 +15,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+from functools import lru_cache
 from typing import Type
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
@@ -34,6 +35,12 @@ class CogneeTool(BaseTool):
         return str(result)
 
 
+@lru_cache(maxsize=1)
+def _tools():
+    """Build the agents' shared tools once per process."""
+    return SerperDevTool(), WebsiteSearchTool(), CogneeTool()
+
+
 @CrewBase
 class AnalyzingApartmentHoodCrew:
     """AnalyzingApartmentHoodCrew crew"""
@@ -42,17 +49,13 @@ class AnalyzingApartmentHoodCrew:
     #     collection_name="contracts_business_5",
     #     qdrant_url=os.getenv("QDRANT_URL"),
     #     qdrant_api_key=os.getenv("QDRANT_API_KEY"),
-
-    search_tool = SerperDevTool()
-    web_rag_tool = WebsiteSearchTool()
     # )
-    cognee_tool = CogneeTool()
 
     @agent
     def manager_agent(self) -> Agent:
         return Agent(
             config=self.agents_config["manager_agent"],
-            tools=[self.search_tool, self.web_rag_tool, self.cognee_tool],
+            tools=list(_tools()),
             allow_delegation=True
         )
 
@@ -60,14 +63,14 @@ class AnalyzingApartmentHoodCrew:
     def location_analysis_specialist(self) -> Agent:
         return Agent(
             config=self.agents_config["location_analysis_specialist"],
-            tools=[self.search_tool, self.web_rag_tool, self.cognee_tool],
+            tools=list(_tools()),
         )
 
     @agent
     def home_analysis_specialist(self) -> Agent:
         return Agent(
             config=self.agents_config["home_analysis_specialist"],
-            tools=[self.search_tool, self.web_rag_tool, self.cognee_tool],
+            tools=list(_tools()),
         )
 
 
@@ -1,33 +1,71 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Dict, Generator, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+def _json_dumps(obj) -> bytes:
+    """Encode a request body as UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+def _json_loads(data):
+    """
+    Decode a JSON response body (bytes or str). Decode errors are raised as a
+    RequestException, like response.json(), so callers' handlers still apply
+    """
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON in response: {e}") from e
+
 class FireworksModel:
     def __init__(self, model_id: str, max_tokens: int = 16384, temperature: float = 0.6):
         self.model_id = model_id
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.responses: List[Dict] = []
-
-    def to_dict(self) -> Dict:
-        return {
-            "model": self.model_id,
-            "max_tokens": self.max_tokens,
+        # Request fields shared by every call, built once
+        self._base_payload = {
+            "model": model_id,
+            "max_tokens": max_tokens,
             "top_p": 1,
             "top_k": 40,
             "presence_penalty": 0,
             "frequency_penalty": 0,
-            "temperature": self.temperature,
+            "temperature": temperature,
         }
 
+    def to_dict(self) -> Dict:
+        return dict(self._base_payload)
+
+    def payload(self, prompt: str, **extra) -> Dict:
+        """Request body for one user prompt, with any extra fields (e.g. stream=True)."""
+        return {**self._base_payload, "messages": [{"role": "user", "content": prompt}], **extra}
+
 class FireworksAPI:
     BASE_URL = "https://api.fireworks.ai/inference/v1/chat/completions"
+    # Keep-alive connections held per host, enough for concurrent batches
+    POOL_SIZE = 32
     
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.api_key = self._load_api_key()
+        # Reuse one session so keep-alive connections are pooled across calls
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE))
+        self.session = session
         self.models = {
             "deepseek": FireworksModel("accounts/fireworks/models/deepseek-r1"),
             "llama": FireworksModel("accounts/fireworks/models/llama-v3p1-8b-instruct"),
@@ -42,42 +80,100 @@ class FireworksAPI:
             raise ValueError("FIREWORKS_API_KEY not found in environment variables")
         return api_key
 
-    def get_completion(self, model: FireworksModel, prompt: str) -> Optional[str]:
-        """Get completion from a specific model."""
-        headers = {
-            "Accept": "application/json",
+    def _headers(self, accept: str = "application/json") -> Dict[str, str]:
+        return {
+            "Accept": accept,
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
+
+    def get_completion(self, model: FireworksModel, prompt: str) -> Optional[str]:
+        """Get completion from a specific model."""
+        headers = self._headers()
         
-        payload = model.to_dict()
-        payload["messages"] = [{"role": "user", "content": prompt}]
+        payload = model.payload(prompt)
         
         try:
-            response = requests.post(self.BASE_URL, headers=headers, json=payload)
+            response = self.session.post(self.BASE_URL, headers=headers, data=_json_dumps(payload))
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
+            content = result['choices'][0]['message']['content']
             
             # Store response for analysis
             model.responses.append({
                 "prompt": prompt,
-                "response": result['choices'][0]['message']['content'],
+                "response": content,
                 "timestamp": datetime.now().isoformat()
             })
             
-            return result['choices'][0]['message']['content']
+            return content
         except requests.exceptions.RequestException as e:
             print(f"Error making API call for model {model.model_id}: {e}")
             return None
 
+    def get_completion_batch(self, jobs: List[Tuple[FireworksModel, str]]) -> List[Optional[str]]:
+        """Run several (model, prompt) completions concurrently over the pooled session."""
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            return list(executor.map(lambda job: self.get_completion(*job), jobs))
+
+    def stream_completion(self, model: FireworksModel, prompt: str) -> Generator[str, None, bool]:
+        """
+        Yield completion text from a specific model as it is generated. The
+        generator returns True only if the stream finished, i.e. the server
+        sent [DONE] or a finish_reason; a broken stream returns False.
+        """
+        headers = self._headers(accept="text/event-stream")
+        
+        payload = model.payload(prompt, stream=True)
+        
+        parts = []
+        complete = False
+        try:
+            with self.session.post(self.BASE_URL, headers=headers, data=_json_dumps(payload), stream=True) as response:
+                response.raise_for_status()
+                # Server-sent events are always UTF-8
+                response.encoding = "utf-8"
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        complete = True
+                        break
+                    choice = _json_loads(data)['choices'][0]
+                    delta = choice.get('delta', {}).get('content')
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                    if choice.get('finish_reason'):
+                        complete = True
+        except requests.exceptions.RequestException as e:
+            print(f"Error streaming from model {model.model_id}: {e}")
+            return False
+        if not complete:
+            return False
+        
+        # Store response for analysis
+        model.responses.append({
+            "prompt": prompt,
+            "response": "".join(parts),
+            "timestamp": datetime.now().isoformat()
+        })
+        return True
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
     def compare_models(self, prompt: str) -> Dict[str, str]:
         """Compare responses from all models for the same prompt."""
-        results = {}
-        for model_name, model in self.models.items():
+        # Requests are network-bound, so send them to all models at once
+        for model_name in self.models:
             print(f"\nTesting {model_name}...")
-            response = self.get_completion(model, prompt)
-            results[model_name] = response
-        return results
+        results = self.get_completion_batch([(model, prompt) for model in self.models.values()])
+        return dict(zip(self.models, results))
 
 def main():
     try:
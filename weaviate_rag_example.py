@@ -1,21 +1,67 @@
 import os
+import asyncio
+import atexit
+import json
 import logging
-from typing import List, Optional
+import threading
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 import re
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import weaviate
+from weaviate.classes.data import DataObject
 from weaviate.classes.init import Auth
 from weaviate.collections import Collection
 from weaviate.exceptions import WeaviateQueryError
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; chunk boundaries fall back to NumPy
+    njit = None
+
+from embeddings import ChunkEmbedder, content_key
+from semantic_cache import SemanticCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Whitespace runs and sentence breaks used by chunk_text
+_WS_RE = re.compile(r'\s+')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Connected clients shared by every WeaviateClient in the process, keyed by
+# (cluster url, api key, openai key), with the number of open WeaviateClients
+# using each; a client is closed when its last user closes, or at interpreter exit
+_CLIENTS: Dict[Tuple[str, str, str], weaviate.WeaviateClient] = {}
+_CLIENT_REFS: Dict[Tuple[str, str, str], int] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Keep-alive session for source downloads, so fetches from the same host reuse
+# one TLS connection; timeout is in seconds
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+DOWNLOAD_TIMEOUT = 30
+
+# Instruction for the grouped generation over retrieved passages
+GROUPED_TASK = """
+                Synthesize a comprehensive answer based on these passages.
+                Include relevant details while maintaining accuracy.
+                If uncertain, acknowledge limitations in the available information.
+                """
+
 @dataclass
 class WeaviateConfig:
     """Configuration for Weaviate client."""
@@ -26,6 +72,25 @@ class WeaviateConfig:
     chunk_size: int = 150
     chunk_overlap: int = 25
     batch_size: int = 100
+    # Batches kept in flight at once while importing
+    concurrent_requests: int = 4
+    # Imports up to this many chunks use direct insert_many calls instead of the batcher
+    insert_many_limit: int = 2000
+    # Requests the async client runs at once
+    max_concurrency: int = 8
+    # OpenAI model used to embed chunks and queries client-side
+    embedding_model: str = "text-embedding-3-small"
+    # Chunks per embeddings request (the API allows up to 2048); 150-word
+    # chunks at 1024 per request stay under the per-request token cap
+    embedding_batch_size: int = 1024
+    # Embedding requests in flight at once; raise for higher OpenAI rate-limit tiers
+    embedding_concurrency: int = 8
+    # Answers to queries at least this similar are served from the cache
+    semantic_cache: bool = True
+    semantic_cache_threshold: float = 0.93
+    semantic_cache_ttl: float = 3600.0
+    # Skip chunks whose normalized text already appeared earlier in the document
+    deduplicate_chunks: bool = True
 
 class WeaviateClient:
     """Manages Weaviate operations with improved error handling and configuration."""
@@ -33,24 +98,23 @@ class WeaviateClient:
     def __init__(self, config: WeaviateConfig):
         self.config = config
         self.client = self._setup_client()
+        # Set once this instance has released its use of the shared client
+        self._closed = False
         self.collection = self._get_or_create_collection()
+        self.query_cache = query_cache(config)
+        self.embed_query = query_embedder(config)
+        # Chunks are embedded client-side so re-imports reuse cached vectors
+        self.embedder = ChunkEmbedder(
+            config.openai_api_key,
+            config.embedding_model,
+            batch_size=config.embedding_batch_size,
+            max_concurrency=config.embedding_concurrency
+        )
 
     def _setup_client(self) -> weaviate.WeaviateClient:
-        """Initialize and return a Weaviate client with proper error handling."""
+        """Return the shared Weaviate client for this config, with proper error handling."""
         try:
-            client = weaviate.connect_to_weaviate_cloud(
-                cluster_url=self.config.url,
-                auth_credentials=Auth.api_key(self.config.api_key),
-                headers={
-                    "X-OpenAI-Api-Key": self.config.openai_api_key
-                }
-            )
-            
-            # Verify connection
-            client.collections.get("_schema")
-            logger.info("Successfully connected to Weaviate Cloud!")
-            return client
-            
+            return shared_client(self.config)
         except Exception as e:
             logger.error(f"Failed to connect to Weaviate: {str(e)}")
             raise ConnectionError(f"Weaviate connection failed: {str(e)}")
@@ -83,7 +147,8 @@ class WeaviateClient:
                         data_type=weaviate.classes.config.DataType.TEXT
                     )
                 ],
-                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.text2vec_openai(),  # Use OpenAI as vectorizer
+                # Chunks and queries are embedded client-side, so Weaviate stores vectors as given
+                vectorizer_config=weaviate.classes.config.Configure.Vectorizer.none(),
                 generative_config=weaviate.classes.config.Configure.Generative.openai()  # Use OpenAI for generation
             )
             return collection
@@ -94,97 +159,425 @@ class WeaviateClient:
     def chunk_text(self, text: str) -> List[str]:
         """Improved text chunking with better handling of sentence boundaries."""
         # Clean and normalize text
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = _WS_RE.sub(' ', text.strip())
+        if not text:
+            return []
         
         # Split into sentences (basic implementation - can be improved with nltk)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        chunks = []
-        current_chunk = []
-        current_size = 0
+        sentences = _SENT_RE.split(text)
         
-        for sentence in sentences:
-            sentence_words = sentence.split()
-            sentence_size = len(sentence_words)
+        return [' '.join(sentences[start:end]) for start, end in self._chunk_bounds(sentences)]
+
+    def chunk_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Chunk text that arrives in pieces, yielding each chunk as soon as it is
+        complete; the chunks match chunk_text on the joined text.
+        """
+        buffer = ""
+        # Sentences of the last chunk, which may still grow
+        pending: List[str] = []
+        for piece in pieces:
+            buffer += piece
+            cut = None
+            for cut in _SENT_RE.finditer(buffer):
+                pass
+            if cut is None:
+                continue
             
-            if current_size + sentence_size <= self.config.chunk_size:
-                current_chunk.extend(sentence_words)
-                current_size += sentence_size
-            else:
-                if current_chunk:
-                    chunks.append(' '.join(current_chunk))
-                current_chunk = sentence_words
-                current_size = sentence_size
+            # Everything before the last sentence break is made of whole sentences
+            pending.extend(_SENT_RE.split(_WS_RE.sub(' ', buffer[:cut.start()].strip())))
+            buffer = buffer[cut.end():]
+            bounds = self._chunk_bounds(pending)
+            for start, end in bounds[:-1]:
+                yield ' '.join(pending[start:end])
+            pending = pending[bounds[-1][0]:]
+        
+        tail = _WS_RE.sub(' ', buffer.strip())
+        if tail:
+            pending.extend(_SENT_RE.split(tail))
+        for start, end in self._chunk_bounds(pending):
+            yield ' '.join(pending[start:end])
+
+    def _chunk_bounds(self, sentences: List[str]) -> List[Tuple[int, int]]:
+        """Greedily pack whole sentences into (start, end) slices; a sentence longer than chunk_size stands alone."""
+        # Words per sentence; sentences are single-spaced after normalizing
+        counts = np.fromiter((sentence.count(' ') + 1 for sentence in sentences), dtype=np.int64, count=len(sentences))
+        if _chunk_ends_jit is not None:
+            ends = _chunk_ends_jit(counts, self.config.chunk_size).tolist()
+            return list(zip([0] + ends[:-1], ends))
+        cumulative = np.cumsum(counts)
         
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        bounds = []
+        start = 0
+        while start < len(sentences):
+            words_before = cumulative[start - 1] if start else 0
+            end = int(np.searchsorted(cumulative, words_before + self.config.chunk_size, side='right'))
+            end = max(end, start + 1)
+            bounds.append((start, end))
+            start = end
             
-        return chunks
+        return bounds
 
-    def import_data(self, chunks: List[str], title: str, metadata: Optional[dict] = None):
-        """Import data with batching and progress tracking."""
+    def import_data(self, chunks: Iterable[str], title: str, metadata: Optional[dict] = None):
+        """Import data with batching and progress tracking; chunks may be a lazy iterator."""
         try:
-            batch = []
-            total_chunks = len(chunks)
+            # Shared by every chunk of the document, so built once
+            metadata_str = metadata_json(metadata)
+            # (position in the document, chunk) pairs, so chunk_index survives deduplication
+            chunks = dedup_chunks(chunks) if self.config.deduplicate_chunks else enumerate(chunks)
             
-            for i, chunk in enumerate(chunks):
-                data_object = {
-                    "content": chunk,
-                    "title": title,
-                    "chunk_index": i,
-                    "metadata": str(metadata or {})
-                }
-                batch.append(data_object)
-                
-                if len(batch) >= self.config.batch_size or i == total_chunks - 1:
-                    with self.collection.batch.dynamic() as batch_writer:
-                        for obj in batch:
-                            batch_writer.add_object(obj)
-                    
-                    logger.info(f"Imported batch: {i+1}/{total_chunks} chunks")
-                    batch = []
+            # Read one past the limit to pick a path without draining the stream
+            head = list(islice(chunks, self.config.insert_many_limit + 1))
+            if len(head) <= self.config.insert_many_limit:
+                total_chunks = len(head)
+                failed = self._insert_many(head, title, metadata_str)
+            else:
+                total_chunks, failed = self._batch_import(chain(head, chunks), title, metadata_str)
+            
+            if failed:
+                logger.error(f"{failed} of {total_chunks} chunks failed to import")
+            logger.info(f"Imported {total_chunks - failed}/{total_chunks} chunks")
                     
         except Exception as e:
             logger.error(f"Failed to import data: {str(e)}")
             raise
+        finally:
+            # Cached answers predate the new chunks, even after a partial import
+            if self.query_cache is not None:
+                self.query_cache.clear()
 
-    def search_and_generate(self, query: str, limit: int = 5) -> dict:
+    def _insert_many(self, chunks: List[Tuple[int, str]], title: str, metadata_str: str) -> int:
+        """Insert objects with one insert_many call per batch; returns the failure count."""
+        indices = [index for index, _ in chunks]
+        contents = [content for _, content in chunks]
+        # Embed everything up front: ceil(n / embedding_batch_size) requests
+        vectors = self.embedder.embed(contents)
+        failed = 0
+        for start in range(0, len(contents), self.config.batch_size):
+            stop = start + self.config.batch_size
+            result = self.collection.data.insert_many(
+                data_objects(indices[start:stop], contents[start:stop], vectors[start:stop], title, metadata_str)
+            )
+            failed += len(result.errors)
+            logger.info(f"Imported batch: {min(stop, len(contents))}/{len(contents)} chunks")
+        return failed
+
+    def _batch_import(self, chunks: Iterable[Tuple[int, str]], title: str, metadata_str: str) -> Tuple[int, int]:
+        """Stream objects through the concurrent fixed-size batcher; returns (count, failures)."""
+        count = 0
+        # The fixed-size batcher sends full batches in the background, several at a time
+        with self.collection.batch.fixed_size(
+            batch_size=self.config.batch_size,
+            concurrent_requests=self.config.concurrent_requests
+        ) as batch_writer:
+            # Embed a round of concurrent requests at a time so the stream is never held in memory
+            for window in windows(chunks, self.config.embedding_batch_size * self.config.embedding_concurrency):
+                indices = [index for index, _ in window]
+                contents = [content for _, content in window]
+                vectors = self.embedder.embed(contents)
+                for obj in data_objects(indices, contents, vectors, title, metadata_str):
+                    batch_writer.add_object(properties=obj.properties, vector=obj.vector)
+                count += len(window)
+                logger.info(f"Queued batch: {count} chunks")
+        
+        return count, len(self.collection.batch.failed_objects)
+
+    def close(self):
+        """Release the shared Weaviate connection and close the embedding cache."""
+        if not self._closed:
+            self._closed = True
+            release_shared_client(self.config)
+        self.embedder.close()
+
+    def search_and_generate(self, query: str, limit: int = 5, namespace: str = "default") -> dict:
         """Enhanced semantic search with generation capabilities."""
+        # One embedding serves both the cache lookup and the search
+        vector = self.embed_query(query)
+        cache_namespace = (namespace, limit)
+        if self.query_cache is not None:
+            cached = self.query_cache.lookup(vector, cache_namespace)
+            if cached is not None:
+                return cached
+        
         try:
-            # Use the simpler direct generation approach
-            response = self.collection.generate.near_text(
-                query=query,
+            # The collection has no vectorizer, so search by the query's embedding
+            response = self.collection.generate.near_vector(
+                near_vector=vector,
                 limit=limit,
-                grouped_task="""
-                Synthesize a comprehensive answer based on these passages.
-                Include relevant details while maintaining accuracy.
-                If uncertain, acknowledge limitations in the available information.
-                """
+                grouped_task=GROUPED_TASK
             )
             
-            return {
-                'generated_response': response.generated,
-                'matching_chunks': [
-                    {
-                        'content': obj.properties.get('content', ''),
-                        'title': obj.properties.get('title', ''),
-                    }
-                    for obj in response.objects
-                ] if hasattr(response, 'objects') else []
-            }
+            result = format_generation(response)
             
         except Exception as e:
             logger.error(f"Search query failed: {str(e)}")
             raise
+        
+        if self.query_cache is not None:
+            self.query_cache.insert(vector, result, cache_namespace)
+        return result
+
+class AsyncWeaviateClient:
+    """Async counterpart of WeaviateClient for running imports and queries concurrently."""
+    
+    def __init__(self, config: WeaviateConfig):
+        self.config = config
+        self.client = weaviate.use_async_with_weaviate_cloud(
+            cluster_url=config.url,
+            auth_credentials=Auth.api_key(config.api_key),
+            headers={
+                "X-OpenAI-Api-Key": config.openai_api_key
+            }
+        )
+        self.collection = self.client.collections.get(config.collection_name)
+        self.query_cache = query_cache(config)
+        self.embed_query = query_embedder(config)
+        self.embedder = ChunkEmbedder(
+            config.openai_api_key,
+            config.embedding_model,
+            batch_size=config.embedding_batch_size,
+            max_concurrency=config.embedding_concurrency
+        )
+        # Caps in-flight requests so bursts stay inside the cluster's rate limits
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+
+    async def __aenter__(self) -> "AsyncWeaviateClient":
+        await self.client.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.close()
+        self.embedder.close()
+
+    async def aimport_data(self, chunks: Iterable[str], title: str, metadata: Optional[dict] = None):
+        """Import data with concurrent insert_many calls, one per batch."""
+        indexed = list(dedup_chunks(chunks) if self.config.deduplicate_chunks else enumerate(chunks))
+        indices = [index for index, _ in indexed]
+        contents = [content for _, content in indexed]
+        metadata_str = metadata_json(metadata)
+        
+        async def insert(start: int) -> int:
+            stop = start + self.config.batch_size
+            objects = data_objects(indices[start:stop], contents[start:stop], vectors[start:stop], title, metadata_str)
+            async with self._semaphore:
+                result = await self.collection.data.insert_many(objects)
+            return len(result.errors)
+        
+        try:
+            # Embed everything up front in as few, concurrent, requests as possible
+            vectors = await self.embedder.aembed(contents)
+            failures = await asyncio.gather(*(
+                insert(start) for start in range(0, len(contents), self.config.batch_size)
+            ))
+            failed = sum(failures)
+            if failed:
+                logger.error(f"{failed} of {len(contents)} chunks failed to import")
+            logger.info(f"Imported {len(contents) - failed}/{len(contents)} chunks")
+        except Exception as e:
+            logger.error(f"Failed to import data: {str(e)}")
+            raise
+        finally:
+            # Cached answers predate the new chunks, even after a partial import
+            if self.query_cache is not None:
+                self.query_cache.clear()
+
+    async def asearch_and_generate(self, query: str, limit: int = 5, namespace: str = "default") -> dict:
+        """Semantic search with generation, awaiting the response."""
+        # Embedding the query is a blocking HTTP call; the vector serves both
+        # the cache lookup and the search
+        vector = await asyncio.to_thread(self.embed_query, query)
+        cache_namespace = (namespace, limit)
+        if self.query_cache is not None:
+            cached = self.query_cache.lookup(vector, cache_namespace)
+            if cached is not None:
+                return cached
+        
+        try:
+            async with self._semaphore:
+                response = await self.collection.generate.near_vector(
+                    near_vector=vector,
+                    limit=limit,
+                    grouped_task=GROUPED_TASK
+                )
+            result = format_generation(response)
+        except Exception as e:
+            logger.error(f"Search query failed: {str(e)}")
+            raise
+        
+        if self.query_cache is not None:
+            self.query_cache.insert(vector, result, cache_namespace)
+        return result
+
+def query_embedder(config: WeaviateConfig) -> Callable[[str], List[float]]:
+    """Return a function that embeds one query with the configured OpenAI model."""
+    # Imported here so the OpenAI SDK is only needed when queries are embedded locally
+    from openai import OpenAI
+    
+    client = OpenAI(api_key=config.openai_api_key)
+    
+    # Repeated queries are common; remember recent vectors
+    @lru_cache(maxsize=256)
+    def embed(text: str) -> List[float]:
+        return client.embeddings.create(model=config.embedding_model, input=[text]).data[0].embedding
+    
+    return embed
+
+def query_cache(config: WeaviateConfig) -> Optional[SemanticCache]:
+    """Build the semantic answer cache for a client, or None when it is disabled."""
+    if not config.semantic_cache:
+        return None
+    return SemanticCache(
+        threshold=config.semantic_cache_threshold,
+        ttl=config.semantic_cache_ttl
+    )
+
+def metadata_json(metadata: Optional[dict]) -> str:
+    """Serialize document metadata as compact JSON, using orjson when available."""
+    # Values JSON cannot represent are stored as their str()
+    if orjson is not None:
+        return orjson.dumps(metadata or {}, default=str).decode()
+    return json.dumps(metadata or {}, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def dedup_chunks(chunks: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (position, chunk) for each chunk whose whitespace-normalized text has
+    not been seen yet; boilerplate repeated through a document is embedded and
+    stored once, and later chunks keep their position in the document
+    """
+    seen = set()
+    for index, chunk in enumerate(chunks):
+        key = content_key(chunk)
+        if key not in seen:
+            seen.add(key)
+            yield index, chunk
+
+def data_objects(
+    indices: List[int],
+    contents: List[str],
+    vectors: List[np.ndarray],
+    title: str,
+    metadata_str: str
+) -> List[DataObject]:
+    """
+    Build the objects for a run of chunks at send time; chunks are carried as
+    parallel index, content and vector lists until then.
+    """
+    return [
+        DataObject(
+            properties={
+                "content": content,
+                "title": title,
+                "chunk_index": index,
+                "metadata": metadata_str
+            },
+            vector=vector.tolist()
+        )
+        for index, content, vector in zip(indices, contents, vectors)
+    ]
+
+def _chunk_ends(counts: np.ndarray, chunk_size: int) -> np.ndarray:
+    """End index of each greedily packed chunk, in one pass over sentence word counts."""
+    ends = np.empty(len(counts), dtype=np.int64)
+    n = 0
+    size = 0
+    for i in range(len(counts)):
+        # Close the current chunk when this sentence would overflow it
+        if size > 0 and size + counts[i] > chunk_size:
+            ends[n] = i
+            n += 1
+            size = 0
+        size += counts[i]
+    if len(counts):
+        ends[n] = len(counts)
+        n += 1
+    return ends[:n]
+
+# Compiled to native code when numba is installed; cache=True keeps the
+# compiled kernel on disk so later runs skip the JIT
+_chunk_ends_jit = njit(cache=True)(_chunk_ends) if njit is not None else None
+
+def windows(items: Iterable, size: int) -> Iterator[list]:
+    """Yield consecutive lists of up to size items."""
+    iterator = iter(items)
+    while True:
+        window = list(islice(iterator, size))
+        if not window:
+            return
+        yield window
+
+def format_generation(response) -> dict:
+    """Shape a generate query response into the generated text and matching chunks."""
+    return {
+        'generated_response': response.generated,
+        'matching_chunks': [
+            {
+                'content': obj.properties.get('content', ''),
+                'title': obj.properties.get('title', ''),
+            }
+            for obj in response.objects
+        ] if hasattr(response, 'objects') else []
+    }
+
+def shared_client(config: WeaviateConfig) -> weaviate.WeaviateClient:
+    """
+    Return the process-wide client for config's cluster, connecting on first
+    use; each call must be paired with release_shared_client
+    """
+    key = (config.url, config.api_key, config.openai_api_key)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None or not client.is_connected():
+            client = weaviate.connect_to_weaviate_cloud(
+                cluster_url=config.url,
+                auth_credentials=Auth.api_key(config.api_key),
+                headers={
+                    "X-OpenAI-Api-Key": config.openai_api_key
+                }
+            )
+            
+            # Verify connection
+            client.collections.get("_schema")
+            logger.info("Successfully connected to Weaviate Cloud!")
+            _CLIENTS[key] = client
+        _CLIENT_REFS[key] = _CLIENT_REFS.get(key, 0) + 1
+        return client
+
+def release_shared_client(config: WeaviateConfig):
+    """Drop one use of the shared client for config's cluster, closing it after the last."""
+    key = (config.url, config.api_key, config.openai_api_key)
+    with _CLIENTS_LOCK:
+        refs = _CLIENT_REFS.get(key, 0) - 1
+        if refs > 0:
+            _CLIENT_REFS[key] = refs
+            return
+        _CLIENT_REFS.pop(key, None)
+        client = _CLIENTS.pop(key, None)
+    if client is not None:
+        client.close()
+
+def _close_shared_clients():
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        _CLIENT_REFS.clear()
+    for client in clients:
+        client.close()
+
+atexit.register(_close_shared_clients)
+
+@lru_cache(maxsize=1)
+def _environment() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Read the connection settings once per process."""
+    load_dotenv()
+    return os.getenv("WCD_URL"), os.getenv("WCD_API_KEY"), os.getenv("OPENAI_API_KEY")
 
 def load_environment() -> WeaviateConfig:
     """Load and validate environment variables."""
-    load_dotenv()
-    
+    url, api_key, openai_api_key = _environment()
     required_vars = {
-        "WEAVIATE_URL": os.getenv("WCD_URL"),  # Updated environment variable name
-        "WEAVIATE_API_KEY": os.getenv("WCD_API_KEY"),  # Updated environment variable name
-        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY")
+        "WEAVIATE_URL": url,  # Updated environment variable name
+        "WEAVIATE_API_KEY": api_key,  # Updated environment variable name
+        "OPENAI_API_KEY": openai_api_key
     }
     
     missing_vars = [var for var, value in required_vars.items() if not value]
@@ -197,6 +590,11 @@ def load_environment() -> WeaviateConfig:
         openai_api_key=required_vars["OPENAI_API_KEY"]
     )
 
+async def run_queries(config: WeaviateConfig, queries: List[str]) -> List[dict]:
+    """Run search_and_generate for several queries at once."""
+    async with AsyncWeaviateClient(config) as client:
+        return await asyncio.gather(*(client.asearch_and_generate(query) for query in queries))
+
 def main():
     """Main execution function with improved error handling and demo capabilities."""
     client = None
@@ -207,16 +605,15 @@ def main():
         
         # Demo: Download and process sample text
         sample_url = "https://raw.githubusercontent.com/progit/progit2/main/book/01-introduction/sections/what-is-git.asc"
-        response = requests.get(sample_url)
-        response.raise_for_status()
-        
-        # Process and import content
-        chunks = client.chunk_text(response.text)
-        client.import_data(
-            chunks=chunks,
-            title="Git Introduction",
-            metadata={"source": sample_url, "type": "documentation"}
-        )
+        # Chunk the body as it downloads and import chunks as they complete
+        with _HTTP.get(sample_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            client.import_data(
+                chunks=client.chunk_stream(response.iter_content(chunk_size=65536, decode_unicode=True)),
+                title="Git Introduction",
+                metadata={"source": sample_url, "type": "documentation"}
+            )
         
         # Demonstrate search and generation
         demo_queries = [
@@ -225,9 +622,10 @@ def main():
             "How does Git handle version control differently from other systems?"
         ]
         
-        for query in demo_queries:
+        # Queries are independent, so run them concurrently
+        results = asyncio.run(run_queries(config, demo_queries))
+        for query, result in zip(demo_queries, results):
             logger.info(f"\nQuery: {query}")
-            result = client.search_and_generate(query)
             logger.info(f"Generated Response:\n{result['generated_response']}\n")
             logger.info("Top matching chunks:")
             for i, chunk in enumerate(result['matching_chunks'], 1):
@@ -238,7 +636,7 @@ def main():
         raise
     finally:
         if client and hasattr(client, 'client'):
-            client.client.close()
+            client.close()
             logger.info("Weaviate client connection closed.")
 
 if __name__ == "__main__":